@@ -5,6 +5,7 @@ from types import SimpleNamespace
 import asyncio
 import inspect
 import random
+import sys
 
 
 @dataclass
@@ -194,8 +195,8 @@ class OpcodeRegistry:
         """
 
         def decorator(func: Callable) -> Callable:
-            # Get opcode name
-            opcode_name = name if name else func.__name__
+            # Get opcode name (interned, since it is looked up on every dispatch)
+            opcode_name = sys.intern(name if name else func.__name__)
 
             # Store category mapping if explicit
             if category:
@@ -259,12 +260,11 @@ class OpcodeRegistry:
 
     async def call(self, name: str, args: list[Any]) -> Any:
         """Call an opcode with arguments."""
-        if name not in self.opcodes:
+        func = self.opcodes.get(name)
+        if func is None:
             raise ValueError(f"Unknown opcode: {name}")
         # Check for injected implementation first (for privileged opcodes)
-        if name in self._injected:
-            return await self._injected[name](args)
-        return await self.opcodes[name](args)
+        return await self._injected.get(name, func)(args)
 
     def inject(self, name: str, implementation: Callable) -> None:
         """Inject implementation for a privileged opcode.
@@ -11,21 +11,73 @@ Installation:
 Authentication:
     Create a client with web_search_create_client(api_key) or set TAVILY_API_KEY
     environment variable. Get your key at https://tavily.com
+
+    Without an explicit client each call builds a temporary one from
+    TAVILY_API_KEY and closes it afterwards. Create a client once with
+    web_search_create_client to reuse its connections across calls.
+
+Connection pooling:
+    Each client keeps a pool of up to LEXFLOW_TAVILY_MAX_CONNECTIONS connections
+    (default 100, read when a client is created) so batched searches are not
+    capped by the library default.
+
+Caching:
+    Each client serves identical searches from its own cache, and concurrent
+    identical searches on a client share one API call. Tune with
+    LEXFLOW_WEB_SEARCH_CACHE_TTL (seconds, default 300, 0 disables) and
+    LEXFLOW_WEB_SEARCH_CACHE_SIZE (entries, default 1024), read when a client
+    is created.
 """
 
+import asyncio
 import os
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 
 from .opcodes import opcode, register_category
 
 try:
+    import httpx
     from tavily import AsyncTavilyClient
 
     TAVILY_AVAILABLE = True
 except ImportError:
     TAVILY_AVAILABLE = False
 
+DEFAULT_MAX_CONNECTIONS = 100
+
+DEFAULT_CACHE_TTL = 300.0
+DEFAULT_CACHE_MAX_SIZE = 1024
+
+_TIME_RANGE_DAYS = MappingProxyType({"day": 1, "week": 7, "month": 30, "year": 365})
+
+
+# Patched in tests to control cache expiry without touching the event loop clock
+_now = time.monotonic
+
+
+def _env_number(name: str, default: float, cast: type, minimum: float) -> Any:
+    """Read a numeric setting from the environment, validating its range.
+
+    Raises:
+        ValueError: If the variable is not a number or is below minimum.
+    """
+    raw = os.environ.get(name)
+    if raw is None:
+        return cast(default)
+    try:
+        value = cast(raw)
+    except ValueError:
+        raise ValueError(
+            f"Invalid {name} {raw!r}. Must be a {cast.__name__} >= {minimum}"
+        ) from None
+    if value < minimum:
+        raise ValueError(f"Invalid {name} {raw!r}. Must be >= {minimum}")
+    return value
+
 
 def _check_tavily():
     """Check if tavily-python is available."""
@@ -40,13 +92,76 @@ class TavilyClient:
 
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self._client = AsyncTavilyClient(api_key=api_key)
+        max_connections = _env_number(
+            "LEXFLOW_TAVILY_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS, int, 1
+        )
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max(1, max_connections // 2),
+            keepalive_expiry=60,
+        )
+        # Same proxy settings tavily honors for the client it would build itself
+        proxies = {
+            "http://": os.environ.get("TAVILY_HTTP_PROXY"),
+            "https://": os.environ.get("TAVILY_HTTPS_PROXY"),
+        }
+        mounts = {
+            scheme: httpx.AsyncHTTPTransport(proxy=proxy, limits=limits)
+            for scheme, proxy in proxies.items()
+            if proxy
+        }
+        self._http = httpx.AsyncClient(limits=limits, mounts=mounts or None)
+        self._client = AsyncTavilyClient(api_key=api_key, client=self._http)
+        self._cache_ttl = _env_number(
+            "LEXFLOW_WEB_SEARCH_CACHE_TTL", DEFAULT_CACHE_TTL, float, 0
+        )
+        self._cache_max_size = _env_number(
+            "LEXFLOW_WEB_SEARCH_CACHE_SIZE", DEFAULT_CACHE_MAX_SIZE, int, 0
+        )
+        # key -> (stored_at, API response), oldest first
+        self._cache: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._in_flight: Dict[tuple, asyncio.Task] = {}
 
     def __repr__(self) -> str:
         return "TavilyClient(api_key=***)"
 
-
-def _resolve_client(client: TavilyClient | None = None) -> "AsyncTavilyClient":
+    async def close(self) -> None:
+        """Close the Tavily client and its connection pool."""
+        await self._client.close()
+        # tavily leaves caller-supplied httpx clients open, and this pool is ours
+        await self._http.aclose()
+
+    async def _cached(self, key: tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a fresh cached response for key, or fetch it once for all callers."""
+        if self._cache_ttl == 0 or self._cache_max_size == 0:
+            return await fetch()
+
+        entry = self._cache.get(key)
+        if entry is not None:
+            stored_at, response = entry
+            if _now() - stored_at < self._cache_ttl:
+                self._cache.move_to_end(key)
+                return response
+            del self._cache[key]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._store_result(key, done))
+        return await asyncio.shield(task)
+
+    def _store_result(self, key: tuple, task: asyncio.Task) -> None:
+        """Move a finished request from in-flight into the result cache."""
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._cache[key] = (_now(), task.result())
+        while len(self._cache) > self._cache_max_size:
+            self._cache.popitem(last=False)
+
+
+def _resolve_client(client: TavilyClient | None = None) -> TavilyClient:
     """Resolve Tavily client from explicit client or environment variable.
 
     Args:
@@ -57,7 +172,7 @@ def _resolve_client(client: TavilyClient | None = None) -> "AsyncTavilyClient":
     """
     _check_tavily()
     if client is not None:
-        return client._client
+        return client
 
     api_key = os.environ.get("TAVILY_API_KEY")
     if not api_key:
@@ -66,7 +181,31 @@ def _resolve_client(client: TavilyClient | None = None) -> "AsyncTavilyClient":
             "web_search_create_client(api_key) or set the TAVILY_API_KEY "
             "environment variable. Get a key at https://tavily.com"
         )
-    return AsyncTavilyClient(api_key=api_key)
+    return TavilyClient(api_key)
+
+
+@asynccontextmanager
+async def _client_for_call(
+    client: TavilyClient | None = None,
+) -> AsyncIterator[TavilyClient]:
+    """Yield the client for one opcode call, closing it if built from the env var."""
+    resolved = _resolve_client(client)
+    try:
+        yield resolved
+    finally:
+        if resolved is not client:
+            await resolved.close()
+
+
+def _cache_key(kind: str, **params: Any) -> tuple:
+    """Build a hashable cache key from normalized request parameters."""
+    query = params["query"]
+    if isinstance(query, str):
+        params["query"] = query.strip().lower()
+    return (kind,) + tuple(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in sorted(params.items())
+    )
 
 
 def _format_results(response: dict) -> list:
@@ -78,7 +217,7 @@ def _format_results(response: dict) -> list:
             "content": item.get("content", ""),
             "score": item.get("score", 0.0),
         }
-        for item in response.get("results", [])
+        for item in response.get("results") or ()
     ]
 
 
@@ -115,6 +254,19 @@ def register_web_search_opcodes():
             raise ValueError("api_key is required. Get your key at https://tavily.com")
         return TavilyClient(api_key)
 
+    @opcode(category="web_search")
+    async def web_search_close_client(client: TavilyClient) -> bool:
+        """Close a Tavily client and release its connection pool.
+
+        Args:
+            client: TavilyClient to close
+
+        Returns:
+            True when the client is closed
+        """
+        await client.close()
+        return True
+
     @opcode(category="web_search")
     async def web_search(
         query: str,
@@ -152,9 +304,6 @@ def register_web_search_opcodes():
                 f"Invalid search_depth '{search_depth}'. Must be 'basic' or 'advanced'"
             )
 
-        tavily = _resolve_client(client)
-        start_time = time.monotonic()
-
         kwargs: Dict[str, Any] = {
             "query": query,
             "max_results": max_results,
@@ -168,8 +317,12 @@ def register_web_search_opcodes():
         if time_range:
             kwargs["days"] = _time_range_to_days(time_range)
 
-        response = await tavily.search(**kwargs)
-        response_time = time.monotonic() - start_time
+        async with _client_for_call(client) as tc:
+            start_time = time.monotonic()
+            response = await tc._cached(
+                _cache_key("search", **kwargs), lambda: tc._client.search(**kwargs)
+            )
+            response_time = time.monotonic() - start_time
 
         return {
             "query": query,
@@ -177,6 +330,73 @@ def register_web_search_opcodes():
             "response_time": response_time,
         }
 
+    @opcode(category="web_search")
+    async def web_search_batch(
+        queries: List[str],
+        client: TavilyClient | None = None,
+        max_results: int = 5,
+        search_depth: str = "basic",
+        max_concurrency: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """Run several web searches concurrently using Tavily API.
+
+        Args:
+            queries: List of search query strings
+            client: TavilyClient from web_search_create_client (optional, falls back to env var)
+            max_results: Maximum number of results per query (default: 5)
+            search_depth: Search depth - "basic" or "advanced" (default: "basic")
+            max_concurrency: Maximum number of searches in flight at once (default: 5)
+
+        Returns:
+            List of dicts in the same order as queries, each shaped like the
+            web_search output (query, results, response_time)
+
+        Example:
+            queries: ["Python 3.12 new features", "asyncio best practices"]
+            max_results: 5
+            max_concurrency: 5
+        """
+        if search_depth not in ("basic", "advanced"):
+            raise ValueError(
+                f"Invalid search_depth '{search_depth}'. Must be 'basic' or 'advanced'"
+            )
+        if max_concurrency < 1:
+            raise ValueError(
+                f"Invalid max_concurrency {max_concurrency}. Must be at least 1"
+            )
+        if isinstance(queries, str):
+            raise ValueError("queries must be a list of query strings, not a string")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def search_one(tc: TavilyClient, query: str) -> Dict[str, Any]:
+            async with semaphore:
+                start_time = time.monotonic()
+                kwargs: Dict[str, Any] = {
+                    "query": query,
+                    "max_results": max_results,
+                    "search_depth": search_depth,
+                }
+                response = await tc._cached(
+                    _cache_key("search", **kwargs),
+                    lambda: tc._client.search(**kwargs),
+                )
+                return {
+                    "query": query,
+                    "results": _format_results(response),
+                    "response_time": time.monotonic() - start_time,
+                }
+
+        # Let every search settle before surfacing the first failure
+        async with _client_for_call(client) as tc:
+            outcomes = await asyncio.gather(
+                *(search_one(tc, query) for query in queries), return_exceptions=True
+            )
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        return outcomes
+
     @opcode(category="web_search")
     async def web_search_news(
         query: str,
@@ -208,16 +428,18 @@ def register_web_search_opcodes():
             time_range: "week"
         """
         days = _time_range_to_days(time_range)
-        tavily = _resolve_client(client)
-        start_time = time.monotonic()
-
-        response = await tavily.search(
-            query=query,
-            max_results=max_results,
-            topic="news",
-            days=days,
-        )
-        response_time = time.monotonic() - start_time
+        kwargs: Dict[str, Any] = {
+            "query": query,
+            "max_results": max_results,
+            "topic": "news",
+            "days": days,
+        }
+        async with _client_for_call(client) as tc:
+            start_time = time.monotonic()
+            response = await tc._cached(
+                _cache_key("news", **kwargs), lambda: tc._client.search(**kwargs)
+            )
+            response_time = time.monotonic() - start_time
 
         return {
             "query": query,
@@ -252,15 +474,16 @@ def register_web_search_opcodes():
             max_results: 5
             max_tokens: 4000
         """
-        tavily = _resolve_client(client)
-
-        context = await tavily.get_search_context(
-            query=query,
-            max_results=max_results,
-            max_tokens=max_tokens,
-        )
-
-        return context
+        kwargs: Dict[str, Any] = {
+            "query": query,
+            "max_results": max_results,
+            "max_tokens": max_tokens,
+        }
+        async with _client_for_call(client) as tc:
+            return await tc._cached(
+                _cache_key("context", **kwargs),
+                lambda: tc._client.get_search_context(**kwargs),
+            )
 
 
 def _time_range_to_days(time_range: str) -> int:
@@ -275,14 +498,9 @@ def _time_range_to_days(time_range: str) -> int:
     Raises:
         ValueError: If time_range is not a valid option
     """
-    mapping = {
-        "day": 1,
-        "week": 7,
-        "month": 30,
-        "year": 365,
-    }
-    if time_range not in mapping:
+    try:
+        return _TIME_RANGE_DAYS[time_range]
+    except KeyError:
         raise ValueError(
             f"Invalid time_range '{time_range}'. Must be one of: day, week, month, year"
-        )
-    return mapping[time_range]
+        ) from None
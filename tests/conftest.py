@@ -0,0 +1,17 @@
+import asyncio
+import sys
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop when it is installed."""
+    if uvloop is None or sys.platform == "win32":
+        return asyncio.get_event_loop_policy()
+    return uvloop.EventLoopPolicy()
@@ -1,7 +1,10 @@
 """Tests for OpcodeRegistry._format_type_hint and get_interface."""
 
+import sys
 from typing import Any, Dict, List, Optional, Union
 
+import pytest
+
 from lexflow.opcodes import OpcodeRegistry
 
 
@@ -106,3 +109,31 @@ class TestGetInterface:
         registry = OpcodeRegistry()
         interface = registry.get_interface("nonexistent_op")
         assert "error" in interface
+
+
+class TestCall:
+    """Tests for opcode registration and dispatch."""
+
+    def test_registered_name_is_interned(self):
+        async def my_op(x: int) -> int:
+            return x
+
+        registry = OpcodeRegistry()
+        registry.register("".join(["my", "_op"]))(my_op)
+        name = next(key for key in registry.opcodes if key == "my_op")
+        assert name is sys.intern("my_op")
+
+    @pytest.mark.asyncio
+    async def test_dispatches_by_name(self):
+        async def double(x: int) -> int:
+            return x * 2
+
+        registry = OpcodeRegistry()
+        registry.register()(double)
+        assert await registry.call("double", [21]) == 42
+
+    @pytest.mark.asyncio
+    async def test_unknown_opcode_raises(self):
+        registry = OpcodeRegistry()
+        with pytest.raises(ValueError, match="Unknown opcode: missing"):
+            await registry.call("missing", [])
@@ -284,3 +284,24 @@ def test_parse_dicts_no_includes():
 
     assert program.main.name == "main"
     assert len(program.externals) == 0
+
+
+def test_parse_dict_null_opcode_raises_value_error():
+    """Test that a node with a null opcode fails with ValueError."""
+    workflow_data = {
+        "workflows": [
+            {
+                "name": "main",
+                "interface": {"inputs": [], "outputs": []},
+                "variables": {},
+                "nodes": {
+                    "start": {"opcode": "workflow_start", "next": "n1", "inputs": {}},
+                    "n1": {"opcode": None, "next": None, "inputs": {}},
+                },
+            }
+        ]
+    }
+
+    parser = Parser()
+    with pytest.raises(ValueError, match="Input should be a valid string"):
+        parser.parse_dict(workflow_data)
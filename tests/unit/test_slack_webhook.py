@@ -0,0 +1,96 @@
+"""Tests for Slack opcodes that work without slack_sdk."""
+
+import importlib.util
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from lexflow import default_registry
+
+pytestmark = pytest.mark.asyncio
+
+SLACK_SDK_AVAILABLE = importlib.util.find_spec("slack_sdk") is not None
+
+
+# =========================================================================
+# Graceful degradation (L1)
+# =========================================================================
+
+
+@pytest.mark.skipif(
+    SLACK_SDK_AVAILABLE, reason="Test only when slack_sdk is NOT installed"
+)
+class TestSlackOpcodesNotAvailable:
+    async def test_slack_opcodes_not_registered_when_not_installed(self):
+        slack_opcodes = [
+            name
+            for name in default_registry.list_opcodes()
+            if name.startswith("slack_") and name != "slack_send_webhook"
+        ]
+        assert len(slack_opcodes) == 0
+
+    async def test_slack_send_webhook_still_registered(self):
+        assert "slack_send_webhook" in default_registry.list_opcodes()
+
+
+# =========================================================================
+# Webhook (no slack_sdk dependency)
+# =========================================================================
+
+
+def _mock_aiohttp_session(response_status=200):
+    """Create a mock aiohttp session with proper async context managers."""
+    mock_response = MagicMock()
+    mock_response.status = response_status
+
+    # session.post() must return an async context manager (not a coroutine)
+    post_ctx = MagicMock()
+    post_ctx.__aenter__ = AsyncMock(return_value=mock_response)
+    post_ctx.__aexit__ = AsyncMock(return_value=False)
+
+    mock_session = MagicMock()
+    mock_session.post.return_value = post_ctx
+
+    # ClientSession() itself is an async context manager
+    session_ctx = MagicMock()
+    session_ctx.__aenter__ = AsyncMock(return_value=mock_session)
+    session_ctx.__aexit__ = AsyncMock(return_value=False)
+
+    return session_ctx
+
+
+class TestSlackWebhook:
+    async def test_send_webhook_success(self):
+        session_ctx = _mock_aiohttp_session(200)
+        with patch("aiohttp.ClientSession", return_value=session_ctx):
+            result = await default_registry.call(
+                "slack_send_webhook",
+                ["https://hooks.slack.com/services/T/B/xxx", "hello"],
+            )
+            assert result is True
+
+    async def test_send_webhook_rejects_non_https(self):
+        with pytest.raises(ValueError) as exc_info:
+            await default_registry.call(
+                "slack_send_webhook",
+                ["http://hooks.slack.com/services/T/B/xxx", "hello"],
+            )
+        assert "must use HTTPS" in str(exc_info.value)
+
+    async def test_send_webhook_rejects_non_slack_host(self):
+        with pytest.raises(ValueError) as exc_info:
+            await default_registry.call(
+                "slack_send_webhook",
+                ["https://evil.com/services/T/B/xxx", "hello"],
+            )
+        assert "host not allowed" in str(exc_info.value)
+
+    async def test_send_webhook_error_status(self):
+        session_ctx = _mock_aiohttp_session(403)
+        with patch("aiohttp.ClientSession", return_value=session_ctx):
+            with pytest.raises(RuntimeError) as exc_info:
+                await default_registry.call(
+                    "slack_send_webhook",
+                    ["https://hooks.slack.com/services/T/B/xxx", "hello"],
+                )
+            assert "status 403" in str(exc_info.value)
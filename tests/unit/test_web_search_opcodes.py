@@ -1,5 +1,6 @@
 """Tests for web search opcodes."""
 
+import asyncio
 import importlib.util
 import pytest
 from unittest.mock import patch, AsyncMock
@@ -9,35 +10,25 @@ from lexflow import default_registry
 TAVILY_AVAILABLE = importlib.util.find_spec("tavily") is not None
 
 
-# Try to import helper functions for testing
-try:
-    from lexflow.opcodes.opcodes_web_search import (
-        _check_tavily,
-        _format_results,
-        _resolve_client,
-        _time_range_to_days,
-        TavilyClient,
-        TAVILY_AVAILABLE as MODULE_TAVILY_AVAILABLE,
-    )
-
-    HELPERS_AVAILABLE = True
-except ImportError:
-    HELPERS_AVAILABLE = False
-    MODULE_TAVILY_AVAILABLE = False
+opcodes_web_search = pytest.importorskip(
+    "lexflow.opcodes.opcodes_web_search", reason="web search opcodes not available"
+)
+_check_tavily = opcodes_web_search._check_tavily
+_format_results = opcodes_web_search._format_results
+_resolve_client = opcodes_web_search._resolve_client
+_time_range_to_days = opcodes_web_search._time_range_to_days
+TavilyClient = opcodes_web_search.TavilyClient
 
 
+@pytest.mark.skipif(not TAVILY_AVAILABLE, reason="tavily not installed")
 class TestCheckTavily:
     """Tests for _check_tavily helper."""
 
-    @pytest.mark.skipif(not HELPERS_AVAILABLE, reason="helpers not available")
-    @pytest.mark.skipif(not TAVILY_AVAILABLE, reason="tavily not installed")
     def test_raises_import_error_when_not_installed(self):
         with patch("lexflow.opcodes.opcodes_web_search.TAVILY_AVAILABLE", False):
             with pytest.raises(ImportError, match="tavily-python is required"):
                 _check_tavily()
 
-    @pytest.mark.skipif(not HELPERS_AVAILABLE, reason="helpers not available")
-    @pytest.mark.skipif(not TAVILY_AVAILABLE, reason="tavily not installed")
     def test_no_error_when_installed(self):
         _check_tavily()
 
@@ -45,7 +36,6 @@ class TestCheckTavily:
 class TestFormatResults:
     """Tests for _format_results helper."""
 
-    @pytest.mark.skipif(not HELPERS_AVAILABLE, reason="helpers not available")
     def test_formats_results(self):
         response = {
             "results": [
@@ -67,12 +57,11 @@ class TestFormatResults:
             "score": 0.95,
         }
 
-    @pytest.mark.skipif(not HELPERS_AVAILABLE, reason="helpers not available")
     def test_empty_results(self):
         assert _format_results({}) == []
         assert _format_results({"results": []}) == []
+        assert _format_results({"results": None}) == []
 
-    @pytest.mark.skipif(not HELPERS_AVAILABLE, reason="helpers not available")
     def test_missing_keys_use_defaults(self):
         response = {"results": [{}]}
         results = _format_results(response)
@@ -87,52 +76,41 @@ class TestFormatResults:
 class TestTimeRangeToDays:
     """Tests for _time_range_to_days helper."""
 
-    @pytest.mark.skipif(not HELPERS_AVAILABLE, reason="helpers not available")
-    def test_day(self):
-        assert _time_range_to_days("day") == 1
-
-    @pytest.mark.skipif(not HELPERS_AVAILABLE, reason="helpers not available")
-    def test_week(self):
-        assert _time_range_to_days("week") == 7
-
-    @pytest.mark.skipif(not HELPERS_AVAILABLE, reason="helpers not available")
-    def test_month(self):
-        assert _time_range_to_days("month") == 30
-
-    @pytest.mark.skipif(not HELPERS_AVAILABLE, reason="helpers not available")
-    def test_year(self):
-        assert _time_range_to_days("year") == 365
+    @pytest.mark.parametrize(
+        "time_range,expected",
+        [("day", 1), ("week", 7), ("month", 30), ("year", 365)],
+    )
+    def test_known_ranges(self, time_range, expected):
+        assert _time_range_to_days(time_range) == expected
 
-    @pytest.mark.skipif(not HELPERS_AVAILABLE, reason="helpers not available")
     def test_unknown_raises_value_error(self):
         with pytest.raises(ValueError, match="Invalid time_range 'unknown'"):
             _time_range_to_days("unknown")
 
 
+@pytest.mark.skipif(not TAVILY_AVAILABLE, reason="tavily not installed")
 class TestResolveClient:
     """Tests for _resolve_client helper."""
 
-    @pytest.mark.skipif(not TAVILY_AVAILABLE, reason="tavily not installed")
-    @pytest.mark.skipif(not HELPERS_AVAILABLE, reason="helpers not available")
     def test_raises_without_client_or_env(self):
         with patch.dict("os.environ", {}, clear=True):
             with pytest.raises(ValueError, match="Tavily API key not found"):
                 _resolve_client()
 
-    @pytest.mark.skipif(not TAVILY_AVAILABLE, reason="tavily not installed")
-    @pytest.mark.skipif(not HELPERS_AVAILABLE, reason="helpers not available")
     def test_uses_env_var_when_no_client(self):
         with patch.dict("os.environ", {"TAVILY_API_KEY": "test-key"}):
             client = _resolve_client()
             assert client is not None
 
-    @pytest.mark.skipif(not TAVILY_AVAILABLE, reason="tavily not installed")
-    @pytest.mark.skipif(not HELPERS_AVAILABLE, reason="helpers not available")
+    def test_builds_fresh_env_client(self):
+        with patch.dict("os.environ", {"TAVILY_API_KEY": "test-key"}):
+            assert _resolve_client() is not _resolve_client()
+
     def test_uses_explicit_client(self):
         tc = TavilyClient(api_key="explicit-key")
         with patch.dict("os.environ", {}, clear=True):
             client = _resolve_client(tc)
-            assert client is tc._client
+            assert client is tc
 
 
 @pytest.mark.skipif(not TAVILY_AVAILABLE, reason="tavily not installed")
@@ -150,12 +128,98 @@ class TestCreateClient:
         with pytest.raises(ValueError, match="api_key is required"):
             await default_registry.call("web_search_create_client", [""])
 
+    @pytest.mark.parametrize(
+        "max_connections, keepalive", [("7", 3), ("2", 1), ("1", 1)]
+    )
+    async def test_uses_sized_connection_pool(self, max_connections, keepalive):
+        with (
+            patch.dict(
+                "os.environ", {"LEXFLOW_TAVILY_MAX_CONNECTIONS": max_connections}
+            ),
+            patch(
+                "lexflow.opcodes.opcodes_web_search.httpx.AsyncClient"
+            ) as mock_http_class,
+            patch("lexflow.opcodes.opcodes_web_search.AsyncTavilyClient"),
+        ):
+            await default_registry.call("web_search_create_client", ["k"])
+
+        expected = opcodes_web_search.httpx.Limits(
+            max_connections=int(max_connections),
+            max_keepalive_connections=keepalive,
+            keepalive_expiry=60,
+        )
+        assert mock_http_class.call_args.kwargs["limits"] == expected
+
+    @pytest.mark.parametrize("value", ["0", "-5", "many"])
+    async def test_invalid_max_connections_raises_error(self, value):
+        with patch.dict("os.environ", {"LEXFLOW_TAVILY_MAX_CONNECTIONS": value}):
+            with pytest.raises(
+                ValueError, match="Invalid LEXFLOW_TAVILY_MAX_CONNECTIONS"
+            ):
+                await default_registry.call("web_search_create_client", ["k"])
+
     async def test_repr_masks_key(self):
         result = await default_registry.call("web_search_create_client", ["secret-key"])
         assert repr(result) == "TavilyClient(api_key=***)"
         assert "secret-key" not in repr(result)
 
 
+@pytest.mark.skipif(not TAVILY_AVAILABLE, reason="tavily not installed")
+class TestCloseClient:
+    """Tests for web_search_close_client opcode."""
+
+    pytestmark = pytest.mark.asyncio
+
+    async def test_closes_explicit_client(self):
+        with patch(
+            "lexflow.opcodes.opcodes_web_search.AsyncTavilyClient"
+        ) as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client_class.return_value = mock_client
+
+            tc = await default_registry.call("web_search_create_client", ["test-key"])
+            result = await default_registry.call("web_search_close_client", [tc])
+
+            assert result is True
+            mock_client.close.assert_awaited_once()
+
+    async def test_releases_connection_pool(self):
+        tc = await default_registry.call("web_search_create_client", ["test-key"])
+        await default_registry.call("web_search_close_client", [tc])
+
+        assert tc._http.is_closed
+
+
+@pytest.mark.skipif(not TAVILY_AVAILABLE, reason="tavily not installed")
+class TestEnvClientAcrossEventLoops:
+    """Env-var clients must not outlive the event loop that used them."""
+
+    def test_separate_asyncio_runs(self):
+        clients = []
+
+        def new_client(**kwargs):
+            mock_client = AsyncMock()
+            mock_client.search.return_value = {"results": []}
+            clients.append(mock_client)
+            return mock_client
+
+        with (
+            patch.dict("os.environ", {"TAVILY_API_KEY": "env-key"}),
+            patch(
+                "lexflow.opcodes.opcodes_web_search.AsyncTavilyClient",
+                side_effect=new_client,
+            ),
+        ):
+            for query in ("first", "second"):
+                result = asyncio.run(default_registry.call("web_search", [query]))
+                assert result["query"] == query
+
+        assert len(clients) == 2
+        for mock_client in clients:
+            mock_client.search.assert_awaited_once()
+            mock_client.close.assert_awaited_once()
+
+
 @pytest.mark.skipif(not TAVILY_AVAILABLE, reason="tavily not installed")
 class TestWebSearchOpcode:
     """Tests for web_search opcode."""
@@ -245,6 +309,7 @@ class TestWebSearchOpcode:
                 # No client — should fall back to env var
                 result = await default_registry.call("web_search", ["test query"])
                 assert result["query"] == "test query"
+                mock_client.close.assert_awaited_once()
 
     async def test_search_without_client_or_env_raises_error(self):
         """Test that search fails without client or env var."""
@@ -258,6 +323,124 @@ class TestWebSearchOpcode:
             await default_registry.call("web_search", ["test query", None, 5, "deep"])
 
 
+@pytest.mark.skipif(not TAVILY_AVAILABLE, reason="tavily not installed")
+class TestWebSearchBatchOpcode:
+    """Tests for web_search_batch opcode."""
+
+    pytestmark = pytest.mark.asyncio
+
+    async def test_batch_search_preserves_order(self):
+        """Test that each query is searched and results keep query order."""
+        queries = ["first", "second", "third"]
+
+        async def fake_search(query, **kwargs):
+            # Finish in reverse order to prove ordering is not completion order
+            await asyncio.sleep(0.01 * (len(queries) - queries.index(query)))
+            return {"results": [{"title": query}]}
+
+        with patch(
+            "lexflow.opcodes.opcodes_web_search.AsyncTavilyClient"
+        ) as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.search = AsyncMock(side_effect=fake_search)
+            mock_client_class.return_value = mock_client
+
+            tc = await default_registry.call("web_search_create_client", ["test-key"])
+            result = await default_registry.call("web_search_batch", [queries, tc])
+
+            assert mock_client.search.await_count == len(queries)
+            assert [r["query"] for r in result] == queries
+            assert [r["results"][0]["title"] for r in result] == queries
+            assert all("response_time" in r for r in result)
+
+    async def test_batch_search_respects_max_concurrency(self):
+        """Test that no more than max_concurrency searches run at once."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_search(query, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"results": []}
+
+        with patch(
+            "lexflow.opcodes.opcodes_web_search.AsyncTavilyClient"
+        ) as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.search = AsyncMock(side_effect=fake_search)
+            mock_client_class.return_value = mock_client
+
+            tc = await default_registry.call("web_search_create_client", ["test-key"])
+            await default_registry.call(
+                "web_search_batch", [[f"q{i}" for i in range(6)], tc, 5, "basic", 2]
+            )
+
+            assert mock_client.search.await_count == 6
+            assert peak == 2
+
+    async def test_batch_search_raises_first_error(self):
+        """Test that a failed query surfaces its error."""
+
+        async def fake_search(query, **kwargs):
+            if query == "bad":
+                raise RuntimeError("rate limited")
+            return {"results": []}
+
+        with patch(
+            "lexflow.opcodes.opcodes_web_search.AsyncTavilyClient"
+        ) as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.search = AsyncMock(side_effect=fake_search)
+            mock_client_class.return_value = mock_client
+
+            tc = await default_registry.call("web_search_create_client", ["test-key"])
+            with pytest.raises(RuntimeError, match="rate limited"):
+                await default_registry.call("web_search_batch", [["good", "bad"], tc])
+
+    async def test_invalid_search_depth_raises_error(self):
+        """Test that invalid search_depth raises ValueError."""
+        with pytest.raises(ValueError, match="Invalid search_depth 'deep'"):
+            await default_registry.call(
+                "web_search_batch", [["test query"], None, 5, "deep"]
+            )
+
+    @pytest.mark.parametrize("max_concurrency", [0, -1])
+    async def test_invalid_max_concurrency_raises_error(self, max_concurrency):
+        with pytest.raises(ValueError, match="Invalid max_concurrency"):
+            await default_registry.call(
+                "web_search_batch", [["test query"], None, 5, "basic", max_concurrency]
+            )
+
+    async def test_string_queries_raises_error(self):
+        with patch(
+            "lexflow.opcodes.opcodes_web_search.AsyncTavilyClient"
+        ) as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client_class.return_value = mock_client
+
+            tc = await default_registry.call("web_search_create_client", ["test-key"])
+            with pytest.raises(ValueError, match="queries must be a list"):
+                await default_registry.call("web_search_batch", ["python", tc])
+
+            mock_client.search.assert_not_awaited()
+
+    async def test_empty_queries_returns_empty_list(self):
+        with patch(
+            "lexflow.opcodes.opcodes_web_search.AsyncTavilyClient"
+        ) as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client_class.return_value = mock_client
+
+            tc = await default_registry.call("web_search_create_client", ["test-key"])
+            result = await default_registry.call("web_search_batch", [[], tc])
+
+            assert result == []
+            mock_client.search.assert_not_awaited()
+
+
 @pytest.mark.skipif(not TAVILY_AVAILABLE, reason="tavily not installed")
 class TestWebSearchNewsOpcode:
     """Tests for web_search_news opcode."""
@@ -420,6 +603,155 @@ class TestWebSearchContextOpcode:
                 await default_registry.call("web_search_context", ["test query"])
 
 
+@pytest.mark.skipif(not TAVILY_AVAILABLE, reason="tavily not installed")
+class TestResultCache:
+    """Tests for the web search result cache."""
+
+    pytestmark = pytest.mark.asyncio
+
+    @pytest.fixture
+    def mock_client(self):
+        with patch(
+            "lexflow.opcodes.opcodes_web_search.AsyncTavilyClient"
+        ) as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.search.return_value = {"results": []}
+            mock_client_class.return_value = mock_client
+            yield mock_client
+
+    async def test_repeated_search_hits_cache(self, mock_client):
+        tc = await default_registry.call("web_search_create_client", ["test-key"])
+        await default_registry.call("web_search", ["Python", tc])
+        await default_registry.call("web_search", ["  python ", tc])
+
+        mock_client.search.assert_awaited_once()
+
+    async def test_different_params_miss_cache(self, mock_client):
+        tc = await default_registry.call("web_search_create_client", ["test-key"])
+        await default_registry.call("web_search", ["python", tc])
+        await default_registry.call("web_search", ["python", tc, 10])
+
+        assert mock_client.search.await_count == 2
+
+    async def test_concurrent_searches_share_request(self, mock_client):
+        release = asyncio.Event()
+
+        async def slow_search(**kwargs):
+            await release.wait()
+            return {"results": []}
+
+        mock_client.search.side_effect = slow_search
+        tc = await default_registry.call("web_search_create_client", ["test-key"])
+
+        pending = asyncio.gather(
+            default_registry.call("web_search", ["python", tc]),
+            default_registry.call("web_search", ["python", tc]),
+        )
+        await asyncio.sleep(0)
+        release.set()
+        await pending
+
+        assert mock_client.search.await_count == 1
+
+    async def test_clients_do_not_share_results(self):
+        release = asyncio.Event()
+        failing, working = AsyncMock(), AsyncMock()
+
+        async def rejected(**kwargs):
+            await release.wait()
+            raise PermissionError("invalid key A")
+
+        failing.search.side_effect = rejected
+        working.search.return_value = {"results": []}
+
+        with patch(
+            "lexflow.opcodes.opcodes_web_search.AsyncTavilyClient",
+            side_effect=[failing, working],
+        ):
+            client_a = await default_registry.call("web_search_create_client", ["a"])
+            client_b = await default_registry.call("web_search_create_client", ["b"])
+
+        pending = asyncio.gather(
+            default_registry.call("web_search", ["python", client_a]),
+            default_registry.call("web_search", ["python", client_b]),
+            return_exceptions=True,
+        )
+        await asyncio.sleep(0)
+        release.set()
+        result_a, result_b = await pending
+
+        assert isinstance(result_a, PermissionError)
+        assert result_b["results"] == []
+        working.search.assert_awaited_once()
+
+    async def test_errors_are_not_cached(self, mock_client):
+        mock_client.search.side_effect = [Exception("boom"), {"results": []}]
+        tc = await default_registry.call("web_search_create_client", ["test-key"])
+
+        with pytest.raises(Exception, match="boom"):
+            await default_registry.call("web_search", ["python", tc])
+        await default_registry.call("web_search", ["python", tc])
+
+        assert mock_client.search.await_count == 2
+
+    async def test_expired_entry_is_refetched(self, mock_client):
+        tc = await default_registry.call("web_search_create_client", ["test-key"])
+        with patch("lexflow.opcodes.opcodes_web_search._now") as clock:
+            clock.return_value = 1000.0
+            await default_registry.call("web_search", ["python", tc])
+            clock.return_value = 1000.0 + opcodes_web_search.DEFAULT_CACHE_TTL
+            await default_registry.call("web_search", ["python", tc])
+
+        assert mock_client.search.await_count == 2
+
+    async def test_evicts_least_recently_used(self, mock_client):
+        with patch.dict("os.environ", {"LEXFLOW_WEB_SEARCH_CACHE_SIZE": "2"}):
+            tc = await default_registry.call("web_search_create_client", ["test-key"])
+
+        await default_registry.call("web_search", ["a", tc])
+        await default_registry.call("web_search", ["b", tc])
+        await default_registry.call("web_search", ["a", tc])
+        await default_registry.call("web_search", ["c", tc])
+        await default_registry.call("web_search", ["a", tc])
+        await default_registry.call("web_search", ["b", tc])
+
+        assert [c.kwargs["query"] for c in mock_client.search.await_args_list] == [
+            "a",
+            "b",
+            "c",
+            "b",
+        ]
+
+    async def test_disabled_when_ttl_is_zero(self, mock_client):
+        with patch.dict("os.environ", {"LEXFLOW_WEB_SEARCH_CACHE_TTL": "0"}):
+            tc = await default_registry.call("web_search_create_client", ["test-key"])
+        await default_registry.call("web_search", ["python", tc])
+        await default_registry.call("web_search", ["python", tc])
+
+        assert mock_client.search.await_count == 2
+
+    async def test_non_string_query_is_passed_through(self, mock_client):
+        tc = await default_registry.call("web_search_create_client", ["test-key"])
+        result = await default_registry.call("web_search", [2024, tc])
+
+        assert result["query"] == 2024
+        assert mock_client.search.await_args.kwargs["query"] == 2024
+
+    @pytest.mark.parametrize(
+        "name, value",
+        [
+            ("LEXFLOW_WEB_SEARCH_CACHE_TTL", "5m"),
+            ("LEXFLOW_WEB_SEARCH_CACHE_TTL", "-1"),
+            ("LEXFLOW_WEB_SEARCH_CACHE_SIZE", "1.5"),
+            ("LEXFLOW_WEB_SEARCH_CACHE_SIZE", "-1"),
+        ],
+    )
+    async def test_malformed_setting_raises_error(self, mock_client, name, value):
+        with patch.dict("os.environ", {name: value}):
+            with pytest.raises(ValueError, match=f"Invalid {name}"):
+                await default_registry.call("web_search_create_client", ["k"])
+
+
 @pytest.mark.skipif(TAVILY_AVAILABLE, reason="Test only when tavily is not installed")
 class TestImportErrorWhenNotInstalled:
     """Tests for graceful handling when tavily is not installed."""
@@ -428,6 +760,10 @@ class TestImportErrorWhenNotInstalled:
         """Test that web_search opcode is not registered when tavily not installed."""
         assert "web_search" not in default_registry.opcodes
 
+    def test_web_search_batch_import_error(self):
+        """Test that web_search_batch opcode is not registered."""
+        assert "web_search_batch" not in default_registry.opcodes
+
     def test_web_search_news_import_error(self):
         """Test that web_search_news opcode is not registered."""
         assert "web_search_news" not in default_registry.opcodes
@@ -436,6 +772,10 @@ class TestImportErrorWhenNotInstalled:
         """Test that web_search_context opcode is not registered."""
         assert "web_search_context" not in default_registry.opcodes
 
+    def test_web_search_close_client_import_error(self):
+        """Test that web_search_close_client opcode is not registered."""
+        assert "web_search_close_client" not in default_registry.opcodes
+
     def test_web_search_create_client_import_error(self):
         """Test that web_search_create_client opcode is not registered."""
         assert "web_search_create_client" not in default_registry.opcodes